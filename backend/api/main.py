@@ -1,10 +1,16 @@
+from concurrent.futures import ProcessPoolExecutor
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
+import aiohttp
+import asyncio
 import logging
+import os
 
 # Import routers
-from .routes import router
+from .routes import router, orchestrator
+from ..core.config import settings
 
 # Configure logging
 logging.basicConfig(
@@ -13,6 +19,17 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+async def _research_worker(queue: asyncio.Queue):
+    """Pull queued research jobs and run them to completion"""
+    while True:
+        job = await queue.get()
+        try:
+            await orchestrator.research(**job)
+        except Exception as e:
+            logger.error(f"Research worker error: {e}")
+        finally:
+            queue.task_done()
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan context manager"""
@@ -24,17 +41,65 @@ async def lifespan(app: FastAPI):
     Path("data").mkdir(exist_ok=True)
     Path("data/chroma_db").mkdir(exist_ok=True)
 
+    # Shared HTTP session with a tuned connector so every extraction and
+    # LLM call reuses pooled TCP/TLS connections instead of handshaking
+    connector = aiohttp.TCPConnector(
+        limit=100,
+        limit_per_host=20,
+        keepalive_timeout=75,
+        enable_cleanup_closed=True,
+        ttl_dns_cache=300
+    )
+    app.state.http = aiohttp.ClientSession(
+        connector=connector,
+        timeout=aiohttp.ClientTimeout(total=30),
+        headers={
+            # Ask for compressed HTML; aiohttp decompresses transparently
+            # and most news/blog sites serve 2-5x smaller bodies
+            "Accept-Encoding": "br, gzip, deflate",
+            "Accept-Language": "en-US,en;q=0.9",
+            "User-Agent": "Mozilla/5.0 (compatible; AIResearchAgent/1.0)"
+        }
+    )
+
+    # Process pool for the CPU-bound trafilatura parse so it doesn't hold
+    # the GIL on the event loop thread
+    app.state.cpu_pool = ProcessPoolExecutor(max_workers=os.cpu_count())
+
+    # Hand the shared session and pool to the orchestrator and warm the
+    # Playwright browser so the first JS-heavy extraction doesn't pay the
+    # Chromium launch cost
+    await orchestrator.astart(
+        http_session=app.state.http,
+        cpu_pool=app.state.cpu_pool
+    )
+
+    # Bounded worker pool for research jobs; the queue gives predictable
+    # concurrency instead of piling jobs onto Starlette's background tasks
+    app.state.job_queue = asyncio.Queue(maxsize=1000)
+    app.state.workers = [
+        asyncio.create_task(_research_worker(app.state.job_queue))
+        for _ in range(settings.max_concurrent_extractions)
+    ]
+
     yield
 
     # Shutdown
     logger.info("🛑 Shutting down AI Research Agent Backend")
+    for worker in app.state.workers:
+        worker.cancel()
+    await asyncio.gather(*app.state.workers, return_exceptions=True)
+    await orchestrator.aclose()
+    app.state.cpu_pool.shutdown()
+    await app.state.http.close()
 
 # Create FastAPI application
 app = FastAPI(
     title="AI Research Agent",
     description="Powerful AI research assistant with web search and content extraction",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 # Add CORS middleware
@@ -66,10 +131,23 @@ async def health_check():
 
 if __name__ == "__main__":
     import uvicorn
+
+    # uvloop roughly doubles throughput for aiohttp-heavy workloads,
+    # but has no Windows build — fall back to the default loop there
+    try:
+        import uvloop
+    except ImportError:
+        uvloop = None
+
+    if uvloop is not None:
+        uvloop.install()
+
     uvicorn.run(
         "main:app",
         host="0.0.0.0",
         port=8000,
-        reload=True,
+        loop="uvloop" if uvloop is not None else "auto",
+        http="httptools",
+        workers=settings.web_concurrency,
         log_level="info"
     )
\ No newline at end of file
@@ -1,6 +1,11 @@
-from fastapi import APIRouter, HTTPException, BackgroundTasks, Response
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import FileResponse, StreamingResponse
+from starlette.background import BackgroundTask
 from typing import Optional, List
 import asyncio
+import json
+import os
+import tempfile
 from uuid import uuid4
 
 from ..models.schemas import (
@@ -22,26 +27,29 @@ router = APIRouter(prefix="/api/v1", tags=["research"])
 @router.post("/research", response_model=ResearchResponse)
 async def create_research(
     request: ResearchRequest,
-    background_tasks: BackgroundTasks
+    http_request: Request
 ):
     """Start a new research job"""
     try:
         job_id = str(uuid4())
-        
-        # Start research in background
-        background_tasks.add_task(
-            orchestrator.research,
-            query=request.query,
-            max_results=request.max_results,
-            freshness=request.freshness,
-            style=request.style.value,
-            search_engines=[e.value for e in request.search_engines]
-        )
-        
-        return ResearchResponse(
+
+        # Enqueue for the worker pool started in the app lifespan
+        await orchestrator.register_job(job_id, request.query)
+        await http_request.app.state.job_queue.put({
+            "job_id": job_id,
+            "query": request.query,
+            "max_results": request.max_results,
+            "freshness": request.freshness,
+            "style": request.style.value,
+            "search_engines": [e.value for e in request.search_engines]
+        })
+
+        # Server-built payload; model_construct skips validation we'd only
+        # be running against our own literals
+        return ResearchResponse.model_construct(
             job_id=job_id,
-            status="started",
-            message="Research job started successfully"
+            status="queued",
+            message="Research job queued successfully"
         )
         
     except Exception as e:
@@ -50,12 +58,32 @@ async def create_research(
 @router.get("/status/{job_id}", response_model=JobStatus)
 async def get_job_status(job_id: str):
     """Get job status"""
-    status = orchestrator.get_job_status(job_id)
+    status = await orchestrator.get_job_status(job_id)
     
     if status["status"] == "not_found":
         raise HTTPException(status_code=404, detail="Job not found")
     
-    return JobStatus(**status)
+    # The status dict comes straight from the orchestrator (and carries no
+    # job_id field), so build without validation
+    return JobStatus.model_construct(job_id=job_id, **status)
+
+@router.get("/stream/{job_id}")
+async def stream_research(job_id: str):
+    """Stream summary tokens for a job as Server-Sent Events"""
+    stream = orchestrator.get_stream(job_id)
+
+    if stream is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    async def event_generator():
+        while True:
+            token = await stream.get()
+            if token is None:
+                break
+            yield f"data: {json.dumps(token)}\n\n"
+        yield "data: [DONE]\n\n"
+
+    return StreamingResponse(event_generator(), media_type="text/event-stream")
 
 @router.get("/research/{job_id}")
 async def get_research_result(job_id: str):
@@ -63,7 +91,7 @@ async def get_research_result(job_id: str):
     result = await orchestrator.get_result(job_id)
     
     if not result:
-        status = orchestrator.get_job_status(job_id)
+        status = await orchestrator.get_job_status(job_id)
         if status["status"] == "not_found":
             raise HTTPException(status_code=404, detail="Job not found")
         elif status["status"] == "failed":
@@ -85,8 +113,17 @@ async def export_research(
         raise HTTPException(status_code=404, detail="Result not found")
     
     if format.lower() == "pdf":
-        pdf_bytes = export_service.to_pdf(result)
-        return Response(
-            content=pdf_bytes,
-            media_type="application/pdf"
+        # ReportLab rendering is blocking CPU work; run it in the
+        # threadpool so it doesn't stall the event loop. Rendering to a
+        # tempfile keeps the document out of memory and lets FileResponse
+        # hand it off via sendfile; the background task reclaims the file
+        # once the response is sent.
+        tmp = tempfile.NamedTemporaryFile(suffix=".pdf", delete=False)
+        tmp.close()
+        await asyncio.to_thread(export_service.to_pdf, result, tmp.name)
+        return FileResponse(
+            tmp.name,
+            media_type="application/pdf",
+            filename=f"research_{job_id}.pdf",
+            background=BackgroundTask(os.unlink, tmp.name)
         )
\ No newline at end of file
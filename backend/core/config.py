@@ -1,44 +1,49 @@
-import os
 from pathlib import Path
 from typing import Optional, List
-from pydantic_settings import BaseSettings
-from dotenv import load_dotenv
-
-# Load environment variables
-load_dotenv()
+from pydantic_settings import BaseSettings, SettingsConfigDict
 
 class Settings(BaseSettings):
-    """Application settings"""
-    
+    """Application settings
+
+    Values come from the environment (or .env) via pydantic-settings;
+    the model is frozen so it is validated exactly once at import.
+    """
+
+    model_config = SettingsConfigDict(
+        env_file=".env",
+        case_sensitive=False,
+        frozen=True
+    )
+
     # API Keys
-    google_ai_api_key: Optional[str] = os.getenv("GOOGLE_AI_API_KEY")
-    huggingface_api_key: Optional[str] = os.getenv("HUGGINGFACE_API_KEY")
-    brave_api_key: Optional[str] = os.getenv("BRAVE_API_KEY")
-    
+    google_ai_api_key: Optional[str] = None
+    huggingface_api_key: Optional[str] = None
+    brave_api_key: Optional[str] = None
+
     # Storage
-    sqlite_db_path: str = os.getenv("SQLITE_DB_PATH", "data/research_cache.db")
-    sqlite_memory_cache: bool = os.getenv("SQLITE_MEMORY_CACHE", "true").lower() == "true"
-    chroma_persist_dir: str = os.getenv("CHROMA_PERSIST_DIR", "data/chroma_db")
-    
+    sqlite_db_path: str = "data/research_cache.db"
+    sqlite_memory_cache: bool = True
+    chroma_persist_dir: str = "data/chroma_db"
+    semantic_similarity_threshold: float = 0.35
+
     # Performance
-    max_concurrent_extractions: int = int(os.getenv("MAX_CONCURRENT_EXTRACTIONS", "5"))
-    max_search_results: int = int(os.getenv("MAX_SEARCH_RESULTS", "10"))
-    cache_ttl: int = int(os.getenv("CACHE_TTL", "3600"))
-    extraction_timeout: int = int(os.getenv("EXTRACTION_TIMEOUT", "30"))
-    llm_timeout: int = int(os.getenv("LLM_TIMEOUT", "60"))
-    
+    max_concurrent_extractions: int = 5
+    max_concurrent_engine_calls: int = 4
+    max_search_results: int = 10
+    cache_ttl: int = 3600
+    llm_cache_ttl: int = 86400
+    extraction_timeout: int = 30
+    llm_timeout: int = 60
+
     # App
-    app_host: str = os.getenv("APP_HOST", "0.0.0.0")
-    app_port: int = int(os.getenv("APP_PORT", "8000"))
-    debug: bool = os.getenv("DEBUG", "false").lower() == "true"
-    
-    class Config:
-        env_file = ".env"
-        case_sensitive = False
+    app_host: str = "0.0.0.0"
+    app_port: int = 8000
+    web_concurrency: int = 1
+    debug: bool = False
 
 # Create settings instance
 settings = Settings()
 
 # Create data directories
 Path(settings.sqlite_db_path).parent.mkdir(parents=True, exist_ok=True)
-Path(settings.chroma_persist_dir).mkdir(parents=True, exist_ok=True)
\ No newline at end of file
+Path(settings.chroma_persist_dir).mkdir(parents=True, exist_ok=True)
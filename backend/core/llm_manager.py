@@ -1,47 +1,175 @@
-import os
 import asyncio
 import aiohttp
+import hashlib
 import google.generativeai as genai
 from typing import Dict, List, Optional, Any
 from enum import Enum
 from datetime import datetime
 import logging
 import json
+import orjson
+import re
+import time
+
+from .config import settings
 
 logger = logging.getLogger(__name__)
 
+# Section headers in LLM output: markdown headings or short "Label:" lines.
+# Compiled once so section parsing is a single C-level pass over the text
+# instead of a per-line Python loop.
+_SECTION_RE = re.compile(
+    r'(?m)^(?:'
+    r'#+\s*(?P<header>\S[^\n]*?)\s*$'
+    r'|'
+    r'(?!https?://)(?=.{1,99}$)(?P<label>[^:\n]+):[^\n]*$'
+    r')'
+)
+
 class LLMProvider(Enum):
     GEMINI_FLASH = "gemini-2.0-flash"
     HUGGINGFACE_MIXTRAL = "mixtral-8x7b"
 
+# Delimits jobs inside a batched prompt and the matching response
+_JOB_MARKER = "###JOB {n}###"
+_JOB_SPLIT_RE = re.compile(r'###JOB \d+###')
+
+class BatchingLLMCoordinator:
+    """Coalesce concurrent LLM calls into one batched request
+
+    Calls arriving within the batch window are combined into a single
+    prompt separated by job markers and the response is split back per
+    job, turning N round-trips into 1 under bursty load.
+    """
+
+    BATCH_WINDOW_S = 0.05
+    MAX_BATCH_CHARS = 30000
+
+    def __init__(self, call_fn):
+        self._call = call_fn
+        self._pending = []
+        self._flush_task = None
+        self._lock = asyncio.Lock()
+
+    async def submit(self, prompt: str, token_queue: Optional[asyncio.Queue] = None) -> Dict:
+        """Queue a prompt and wait for its (possibly batched) result"""
+        future = asyncio.get_running_loop().create_future()
+
+        async with self._lock:
+            self._pending.append((prompt, token_queue, future))
+            if self._flush_task is None:
+                self._flush_task = asyncio.create_task(self._flush_after_window())
+
+        return await future
+
+    async def _flush_after_window(self):
+        await asyncio.sleep(self.BATCH_WINDOW_S)
+
+        async with self._lock:
+            batch = self._pending
+            self._pending = []
+            self._flush_task = None
+
+        # Group jobs so each combined prompt stays under the size cap
+        groups = []
+        current, size = [], 0
+        for job in batch:
+            prompt_len = len(job[0])
+            if current and size + prompt_len > self.MAX_BATCH_CHARS:
+                groups.append(current)
+                current, size = [], 0
+            current.append(job)
+            size += prompt_len
+        if current:
+            groups.append(current)
+
+        for group in groups:
+            await self._run_group(group)
+
+    async def _run_group(self, group):
+        if len(group) == 1:
+            # Single job: call directly so streaming still works
+            prompt, token_queue, future = group[0]
+            try:
+                future.set_result(await self._call(prompt, token_queue))
+            except Exception as e:
+                future.set_exception(e)
+            return
+
+        combined = "\n".join(
+            f"{_JOB_MARKER.format(n=i + 1)}\n{prompt}\n"
+            f"(Answer each job separately, preceding each answer with its "
+            f"###JOB N### marker.)"
+            if i == len(group) - 1 else
+            f"{_JOB_MARKER.format(n=i + 1)}\n{prompt}"
+            for i, (prompt, _, _) in enumerate(group)
+        )
+
+        try:
+            result = await self._call(combined, None)
+        except Exception as e:
+            for _, _, future in group:
+                future.set_exception(e)
+            return
+
+        parts = [p.strip() for p in _JOB_SPLIT_RE.split(result["text"]) if p.strip()]
+        tokens_each = result.get("tokens", 0) / len(group)
+
+        for i, (_, token_queue, future) in enumerate(group):
+            text = parts[i] if i < len(parts) else result["text"]
+            if token_queue:
+                await token_queue.put(text)
+            future.set_result({"text": text, "tokens": tokens_each})
+
 class LLMManager:
     """Manage multiple LLM providers with automatic fallback"""
-    
-    def __init__(self):
+
+    # Circuit breaker: open a provider after this many consecutive
+    # failures, then retry it once the cooldown passes
+    FAILURE_THRESHOLD = 3
+    COOLDOWN_SECONDS = 60
+
+
+    def __init__(self, session: Optional[aiohttp.ClientSession] = None, cache=None):
         self.providers = self._initialize_providers()
+        # Sort once; disabling a provider just flips its "available" flag
+        self._provider_order = tuple(sorted(
+            self.providers.items(),
+            key=lambda x: x[1]["priority"]
+        ))
         self.usage_tracker = {}
+        self.session = session
+        self.cache = cache
+        self._gemini_batcher = BatchingLLMCoordinator(self._call_gemini)
         
     def _initialize_providers(self) -> Dict:
         """Initialize available LLM providers"""
         providers = {}
         
+        # Keys come from settings: pydantic-settings reads .env into the
+        # Settings instance without touching os.environ, so env probes
+        # would miss keys supplied the way run.sh/run.bat document
         # Initialize Gemini
-        if os.getenv("GOOGLE_AI_API_KEY"):
-            genai.configure(api_key=os.getenv("GOOGLE_AI_API_KEY"))
+        if settings.google_ai_api_key:
+            genai.configure(api_key=settings.google_ai_api_key)
             providers[LLMProvider.GEMINI_FLASH] = {
                 "available": True,
                 "priority": 1,
-                "cost_per_million": 0
+                "cost_per_million": 0,
+                "failures": 0,
+                "open_until": 0.0
             }
             logger.info("✓ Initialized Gemini Flash")
         
         # Initialize Hugging Face
-        if os.getenv("HUGGINGFACE_API_KEY"):
+        if settings.huggingface_api_key:
             providers[LLMProvider.HUGGINGFACE_MIXTRAL] = {
                 "available": True,
                 "priority": 3,
                 "cost_per_million": 0,
-                "api_key": os.getenv("HUGGINGFACE_API_KEY")
+                "api_key": settings.huggingface_api_key,
+                "failures": 0,
+                "open_until": 0.0
             }
             logger.info("✓ Initialized Hugging Face")
         
@@ -51,7 +179,8 @@ class LLMManager:
         self,
         query: str,
         contents: List[Dict],
-        style: str = "comprehensive"
+        style: str = "comprehensive",
+        token_queue: Optional[asyncio.Queue] = None
     ) -> Dict:
         """
         Generate research summary using best available LLM
@@ -60,59 +189,102 @@ class LLMManager:
             query: Research query
             contents: Extracted content from sources
             style: Summary style (comprehensive, brief, technical)
+            token_queue: Optional queue that receives text chunks as they stream
             
         Returns:
             Summary with metadata
         """
+        # Exact re-runs (UI retries, exports) skip the LLM round-trip entirely
+        cache_key = self._summary_cache_key(query, contents, style)
+        if self.cache:
+            cached = await self.cache.get(cache_key)
+            if cached:
+                summary = json.loads(cached)
+                summary["model_used"] += " (cached)"
+                if token_queue:
+                    await token_queue.put(summary["summary"])
+                return summary
+
         # Prepare context
         context = self._prepare_context(contents)
         prompt = self._create_prompt(query, context, style)
         
-        # Try providers in order of priority
-        sorted_providers = sorted(
-            self.providers.items(),
-            key=lambda x: x[1]["priority"]
-        )
-        
         last_error = None
-        
-        for provider, config in sorted_providers:
+
+        # Try providers in order of priority (pre-sorted at init)
+        for provider, config in self._provider_order:
             if not config["available"]:
                 continue
-            
+
+            # Skip providers whose circuit is open
+            if time.monotonic() < config["open_until"]:
+                continue
+
+
             try:
                 logger.info(f"Trying {provider.value}...")
                 
                 if provider == LLMProvider.GEMINI_FLASH:
-                    result = await self._call_gemini(prompt)
+                    result = await self._gemini_batcher.submit(prompt, token_queue)
                 elif provider == LLMProvider.HUGGINGFACE_MIXTRAL:
-                    result = await self._call_huggingface(prompt, config["api_key"])
+                    result = await self._call_huggingface(prompt, config["api_key"], token_queue)
                 else:
                     continue
                 
                 # Parse and structure the summary
-                return self._parse_summary(
+                summary = self._parse_summary(
                     result["text"],
                     contents,
                     provider.value,
                     result.get("tokens", 0),
                     config.get("cost_per_million", 0)
                 )
-                
+
+                if self.cache:
+                    await self.cache.set(
+                        key=cache_key,
+                        value=json.dumps(summary),
+                        ttl=settings.llm_cache_ttl
+                    )
+
+                config["failures"] = 0
+                return summary
+
+
             except Exception as e:
                 last_error = f"{provider.value}: {str(e)}"
                 logger.error(last_error)
-                
-                # Temporarily disable failed provider
-                config["available"] = False
+
+                # Open the circuit after repeated failures; a transient 503
+                # no longer disables the provider for the process lifetime
+                config["failures"] += 1
+                if config["failures"] >= self.FAILURE_THRESHOLD:
+                    config["open_until"] = time.monotonic() + self.COOLDOWN_SECONDS
+                    config["failures"] = 0
+                    logger.warning(
+                        f"Circuit opened for {provider.value} "
+                        f"({self.COOLDOWN_SECONDS}s cooldown)"
+                    )
                 continue
 
         # If all providers failed, return error summary
         return self._create_error_summary(last_error or "No LLM providers available")
 
+    @staticmethod
+    def _summary_cache_key(query: str, contents: List[Dict], style: str) -> str:
+        """Cache key for a generated summary: query + source set + style"""
+        urls = sorted(c.get("url", "") for c in contents)
+        key_data = "|".join([query, *urls, style])
+        return "llm:" + hashlib.sha256(key_data.encode()).hexdigest()
+
+    # Overall prompt budget; LLM latency and cost are linear in input tokens
+    MAX_CONTEXT_CHARS = 16000
+    MAX_SOURCE_CHARS = 2000
+
     def _prepare_context(self, contents: List[Dict]) -> str:
-        """Prepare context from extracted contents"""
+        """Prepare context from extracted contents, capped by total size"""
         context_parts = []
+        total = 0
 
         for i, content in enumerate(contents[:10]):  # Limit to top 10 sources
             if not content.get("success"):
@@ -121,12 +293,19 @@ class LLMManager:
             title = content.get("title", f"Source {i+1}")
             text = content.get("text", "").strip()
 
-            if text:
-                # Limit text length per source
-                if len(text) > 2000:
-                    text = text[:2000] + "..."
+            if not text:
+                continue
+
+            # Limit text length per source and against the overall budget
+            limit = min(self.MAX_SOURCE_CHARS, self.MAX_CONTEXT_CHARS - total)
+            if len(text) > limit:
+                text = text[:limit] + "..."
 
-                context_parts.append(f"## {title}\n{text}")
+            context_parts.append(f"## {title}\n{text}")
+            total += len(text)
+
+            if total >= self.MAX_CONTEXT_CHARS:
+                break
 
         return "\n\n".join(context_parts)
 
@@ -171,18 +350,35 @@ Use precise technical language and focus on implementation details."""
             return base_prompt + """
 Please provide a balanced summary covering the main points from the sources."""
 
-    async def _call_gemini(self, prompt: str) -> Dict:
-        """Call Google Gemini API"""
+    async def _call_gemini(
+        self,
+        prompt: str,
+        token_queue: Optional[asyncio.Queue] = None
+    ) -> Dict:
+        """Call Google Gemini API, streaming chunks as they arrive"""
         model = genai.GenerativeModel('gemini-2.0-flash-exp')
 
-        response = await model.generate_content_async(prompt)
+        response = await model.generate_content_async(prompt, stream=True)
+
+        # Stream chunks to any attached client while accumulating the full text
+        parts = []
+        async for chunk in response:
+            if chunk.text:
+                parts.append(chunk.text)
+                if token_queue:
+                    await token_queue.put(chunk.text)
 
         return {
-            "text": response.text,
+            "text": "".join(parts),
             "tokens": response.usage_metadata.total_token_count if hasattr(response, 'usage_metadata') else 0
         }
 
-    async def _call_huggingface(self, prompt: str, api_key: str) -> Dict:
+    async def _call_huggingface(
+        self,
+        prompt: str,
+        api_key: str,
+        token_queue: Optional[asyncio.Queue] = None
+    ) -> Dict:
         """Call Hugging Face API"""
         url = "https://api-inference.huggingface.co/models/mistralai/Mixtral-8x7B-Instruct-v0.1"
 
@@ -200,23 +396,32 @@ Please provide a balanced summary covering the main points from the sources."""
             }
         }
 
-        async with aiohttp.ClientSession() as session:
-            async with session.post(url, headers=headers, json=data) as response:
-                if response.status != 200:
-                    raise Exception(f"Hugging Face API error: {response.status}")
+        if not self.session:
+            # Standalone fallback; in the API the lifespan injects a shared session
+            self.session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=30)
+            )
 
-                result = await response.json()
+        async with self.session.post(url, headers=headers, json=data) as response:
+            if response.status != 200:
+                raise Exception(f"Hugging Face API error: {response.status}")
 
-                # Handle different response formats
-                if isinstance(result, list) and result:
-                    text = result[0].get("generated_text", "")
-                else:
-                    text = result.get("generated_text", "")
+            result = orjson.loads(await response.read())
 
-                return {
-                    "text": text,
-                    "tokens": len(text.split()) * 1.3  # Rough estimate
-                }
+            # Handle different response formats
+            if isinstance(result, list) and result:
+                text = result[0].get("generated_text", "")
+            else:
+                text = result.get("generated_text", "")
+
+            # The HF inference API call is buffered, so push the full text once
+            if token_queue and text:
+                await token_queue.put(text)
+
+            return {
+                "text": text,
+                "tokens": len(text.split()) * 1.3  # Rough estimate
+            }
 
     def _parse_summary(self, text: str, contents: List[Dict],
                       model: str, tokens: int, cost_per_million: float) -> Dict:
@@ -252,33 +457,20 @@ Please provide a balanced summary covering the main points from the sources."""
         """Extract sections from LLM response"""
         sections = {}
         current_section = "Overview"
-        current_content = []
-
-        lines = text.split("\n")
-
-        for line in lines:
-            line = line.strip()
-            if not line:
-                continue
+        prev_end = 0
 
-            # Check for section headers
-            if line.startswith("#") or (len(line) < 100 and ":" in line and not line.startswith("http")):
-                # Save previous section
-                if current_content:
-                    sections[current_section] = "\n".join(current_content).strip()
-                    current_content = []
+        for match in _SECTION_RE.finditer(text):
+            body = text[prev_end:match.start()].strip()
+            if body:
+                sections[current_section] = body
 
-                # Extract new section name
-                if line.startswith("#"):
-                    current_section = line.lstrip("#").strip()
-                else:
-                    current_section = line.split(":")[0].strip()
-            else:
-                current_content.append(line)
+            current_section = (match.group("header") or match.group("label")).strip()
+            prev_end = match.end()
 
         # Save last section
-        if current_content:
-            sections[current_section] = "\n".join(current_content).strip()
+        body = text[prev_end:].strip()
+        if body:
+            sections[current_section] = body
 
         return sections
 
@@ -1,7 +1,10 @@
 import asyncio
-import hashlib
-import json
 import logging
+import orjson
+import re
+import time
+import xxhash
+from collections import OrderedDict
 from datetime import datetime
 from typing import Dict, List, Optional, Any
 from uuid import uuid4
@@ -11,30 +14,133 @@ from ..core.extractor import ContentExtractor
 from ..core.llm_manager import LLMManager
 from ..core.vector_store import SemanticCache
 from ..utils.cache import SQLiteCache
-from ..models.schemas import (
-    ResearchResult,
-    ResearchSummary,
-    Source,
-    SearchResult,
-    ExtractedContent
-)
 from ..core.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Queries containing any of these words are routed to the news backend;
+# compiled once so detection is a single C-level scan with word boundaries
+_NEWS_RE = re.compile(
+    r'\b(news|latest|breaking|today|recent|update|announcement)\b',
+    re.IGNORECASE
+)
+
 class ResearchOrchestrator:
     """Main orchestrator for research operations"""
 
+    # Bound the in-memory job table: a long-running service would otherwise
+    # accumulate a full result per job forever. Oldest jobs fall off once
+    # the cap is hit; anything older than a day is gone regardless.
+    JOB_CAP = 10_000
+    JOB_TTL_SECONDS = 86_400
+
     def __init__(self):
-        self.searcher = MultiSearcher(brave_api_key=settings.brave_api_key)
-        self.extractor = ContentExtractor()
-        self.llm_manager = LLMManager()
-        self.vector_cache = SemanticCache()
         self.sqlite_cache = SQLiteCache(
             db_path=settings.sqlite_db_path,
             use_memory=settings.sqlite_memory_cache
         )
-        self.jobs = {}  # In-memory job tracking
+        self.searcher = MultiSearcher(
+            brave_api_key=settings.brave_api_key,
+            max_concurrent_engine_calls=settings.max_concurrent_engine_calls
+        )
+        self.extractor = ContentExtractor(
+            cache=self.sqlite_cache,
+            cache_ttl=settings.cache_ttl
+        )
+        self.llm_manager = LLMManager(cache=self.sqlite_cache)
+        self.vector_cache = SemanticCache()
+        self.jobs = OrderedDict()  # In-memory job tracking, LRU-bounded
+        # Hot-result shield: bounded LRU of already-parsed result dicts so
+        # repeat queries skip the SQLite hop and the JSON parse
+        self._hot = OrderedDict()
+        self._hot_cap = 512
+
+    async def astart(self, http_session=None, cpu_pool=None):
+        """Bring up the long-lived resources once, at app startup
+
+        The extractor's HTTP session, process pool and browser are shared
+        across every job; constructing them per request would pay the full
+        connection/launch cost on each research call.
+        """
+        if http_session is not None:
+            self.extractor.session = http_session
+            self.llm_manager.session = http_session
+        if cpu_pool is not None:
+            self.extractor.cpu_pool = cpu_pool
+        # Open the vector store here so no user request pays the ChromaDB
+        # cold start (and the per-call initialized checks could go away)
+        await self.vector_cache.initialize()
+        await self._warm_extractor()
+
+    async def aclose(self):
+        """Release the long-lived resources at app shutdown"""
+        await self.extractor.cleanup()
+        await self.sqlite_cache.close()
+
+    async def register_job(self, job_id: str, query: str):
+        """Register a queued job so status polling works before a worker picks it up"""
+        job = {
+            "status": "queued",
+            "progress": 0,
+            "started_at": datetime.now(),
+            "query": query,
+            "stream": asyncio.Queue()
+        }
+        self._store_job(job_id, job)
+        await self._persist_job(job_id, job)
+
+    def get_stream(self, job_id: str) -> Optional[asyncio.Queue]:
+        """Get the token stream queue for a job, if any"""
+        job = self._get_job(job_id)
+        return job.get("stream") if job else None
+
+    def _store_job(self, job_id: str, job: Dict):
+        """Insert a job, evicting expired and over-cap entries from the front"""
+        job["expires_at"] = time.monotonic() + self.JOB_TTL_SECONDS
+        self.jobs[job_id] = job
+        self.jobs.move_to_end(job_id)
+        now = time.monotonic()
+        while self.jobs and (
+            len(self.jobs) > self.JOB_CAP
+            or next(iter(self.jobs.values()))["expires_at"] <= now
+        ):
+            self.jobs.popitem(last=False)
+
+    def _get_job(self, job_id: str) -> Optional[Dict]:
+        """Look up a job, dropping it if its TTL has lapsed"""
+        job = self.jobs.get(job_id)
+        if job and job["expires_at"] <= time.monotonic():
+            del self.jobs[job_id]
+            return None
+        return job
+
+    async def _persist_job(self, job_id: str, job: Dict):
+        """Mirror job state into SQLite so every worker process sees it
+
+        With web_concurrency > 1 each process has its own self.jobs; the
+        shared SQLite row is what makes polling from any worker correct.
+        """
+        # The stream queue and monotonic expiry are process-local
+        payload = {
+            k: v for k, v in job.items()
+            if k not in ("stream", "expires_at")
+        }
+        await self.sqlite_cache.set(
+            key=f"job:{job_id}",
+            value=orjson.dumps(payload),
+            ttl=settings.cache_ttl
+        )
+
+    async def _load_job(self, job_id: str) -> Optional[Dict]:
+        """Read a job from the in-process table, falling back to SQLite"""
+        job = self._get_job(job_id)
+        if job:
+            return job
+
+        cached = await self.sqlite_cache.get(f"job:{job_id}")
+        if cached:
+            return orjson.loads(cached)
+        return None
 
     async def research(
         self,
@@ -42,7 +148,8 @@ class ResearchOrchestrator:
         max_results: int = 10,
         freshness: Optional[str] = None,
         style: str = "comprehensive",
-        search_engines: List[str] = None
+        search_engines: List[str] = None,
+        job_id: Optional[str] = None
     ) -> str:
         """
         Execute complete research pipeline
@@ -53,22 +160,27 @@ class ResearchOrchestrator:
             freshness: Time filter
             style: Summary style
             search_engines: List of search engines to use
+            job_id: Pre-assigned job ID (generated if not provided)
 
         Returns:
             Job ID for tracking
         """
-        job_id = str(uuid4())
-        self.jobs[job_id] = {
+        job_id = job_id or str(uuid4())
+        existing = self._get_job(job_id) or {}
+        job = {
             "status": "starting",
             "progress": 0,
-            "started_at": datetime.now(),
-            "query": query
+            "started_at": existing.get("started_at", datetime.now()),
+            "query": query,
+            "stream": existing.get("stream") or asyncio.Queue()
         }
+        self._store_job(job_id, job)
+        await self._persist_job(job_id, job)
 
-        # Start research in background
-        asyncio.create_task(self._execute_research(
+        # Run the pipeline; concurrency is bounded by the worker pool
+        await self._execute_research(
             job_id, query, max_results, freshness, style, search_engines
-        ))
+        )
 
         return job_id
 
@@ -82,61 +194,73 @@ class ResearchOrchestrator:
         search_engines: List[str]
     ):
         """Execute the research pipeline"""
+        # Bind the job entry once; eviction only happens on insert, so the
+        # reference stays valid for the lifetime of the pipeline
+        job = self.jobs[job_id]
         try:
-            self.jobs[job_id]["status"] = "searching"
-            self.jobs[job_id]["progress"] = 10
+            job["status"] = "searching"
+            job["progress"] = 10
 
             # Check cache first
             cache_key = self._generate_cache_key(query, max_results, freshness, style)
-            cached_result = await self._check_cache(cache_key)
+            cached_result = await self._check_cache(query, cache_key)
 
             if cached_result:
-                self.jobs[job_id]["status"] = "completed"
-                self.jobs[job_id]["progress"] = 100
-                self.jobs[job_id]["result"] = cached_result
-                self.jobs[job_id]["from_cache"] = True
+                job["status"] = "completed"
+                job["progress"] = 100
+                job["result"] = cached_result
+                job["from_cache"] = True
+                await self._persist_job(job_id, job)
                 return
 
             # Perform web search with enhanced DuckDuckGo capabilities
-            self.jobs[job_id]["status"] = "searching"
-            self.jobs[job_id]["progress"] = 20
+            job["status"] = "searching"
+            job["progress"] = 20
 
             # Detect if this is a news-related query
-            news_keywords = ['news', 'latest', 'breaking', 'today', 'recent', 'update', 'announcement']
-            is_news_query = any(keyword in query.lower() for keyword in news_keywords)
+            is_news_query = bool(_NEWS_RE.search(query))
 
+            # Overlap the search I/O with browser warmup under structured
+            # concurrency: a failed search cancels the warmup sibling and
+            # surfaces as a clean ExceptionGroup instead of an orphaned task
             async with self.searcher:
-                if is_news_query and "duckduckgo" in (search_engines or ["duckduckgo"]):
-                    # Use news-specific search for news queries
-                    search_results = await self.searcher.search_news(
-                        query=query,
-                        count=max_results,
-                        freshness=freshness
-                    )
-                    logger.info(f"Used news search for query: {query}")
-                else:
-                    # Use regular web search
-                    search_results = await self.searcher.search(
-                        query=query,
-                        count=max_results,
-                        freshness=freshness,
-                        engines=search_engines or ["duckduckgo"]
-                    )
-
-            self.jobs[job_id]["progress"] = 40
+                async with asyncio.TaskGroup() as tg:
+                    if is_news_query and "duckduckgo" in (search_engines or ["duckduckgo"]):
+                        # Use news-specific search for news queries
+                        search_task = tg.create_task(self.searcher.search_news(
+                            query=query,
+                            count=max_results,
+                            freshness=freshness
+                        ))
+                        logger.info(f"Used news search for query: {query}")
+                    else:
+                        # Use regular web search
+                        search_task = tg.create_task(self.searcher.search(
+                            query=query,
+                            count=max_results,
+                            freshness=freshness,
+                            engines=search_engines or ["duckduckgo"]
+                        ))
+
+                    # Warmup failures are swallowed inside _warm_extractor,
+                    # so only a search error can fail the group
+                    if not self.extractor.browser:
+                        tg.create_task(self._warm_extractor())
+
+            search_results = search_task.result()
+            job["progress"] = 40
 
             # Extract content from top results
-            self.jobs[job_id]["status"] = "extracting"
+            job["status"] = "extracting"
+            await self._persist_job(job_id, job)
             urls = [result["url"] for result in search_results[:max_results]]
 
-            await self.extractor.initialize()
             extracted_contents = await self.extractor.extract_batch(
                 urls=urls,
                 max_concurrent=settings.max_concurrent_extractions
             )
-            await self.extractor.cleanup()
 
-            self.jobs[job_id]["progress"] = 70
+            job["progress"] = 70
 
             # Filter successful extractions
             valid_contents = [
@@ -145,60 +269,87 @@ class ResearchOrchestrator:
             ]
 
             # Generate summary
-            self.jobs[job_id]["status"] = "summarizing"
-            self.jobs[job_id]["progress"] = 85
+            job["status"] = "summarizing"
+            job["progress"] = 85
+            await self._persist_job(job_id, job)
 
             if valid_contents:
                 summary = await self.llm_manager.generate_summary(
                     query=query,
                     contents=valid_contents,
-                    style=style
+                    style=style,
+                    token_queue=job.get("stream")
                 )
             else:
                 summary = self._create_empty_summary()
 
-            # Create result object
-            result = ResearchResult(
-                job_id=job_id,
-                query=query,
-                search_engines_used=search_engines or ["duckduckgo"],
-                search_results=[
-                    SearchResult(**result) for result in search_results
+            # Build the result dict directly: the data comes from our own
+            # searcher/extractor/LLM, so re-validating it through nested
+            # pydantic models just to dump it back out is wasted work
+            result = {
+                "job_id": job_id,
+                "query": query,
+                "search_engines_used": search_engines or ["duckduckgo"],
+                "search_results": [
+                    {
+                        "title": r.get("title", ""),
+                        "url": r.get("url", ""),
+                        "description": r.get("description", ""),
+                        "source": r.get("source", ""),
+                        "relevance_score": r.get("relevance_score", 0.0),
+                        "age": r.get("age")
+                    }
+                    for r in search_results
                 ],
-                extracted_count=len(valid_contents),
-                summary=ResearchSummary(**summary),
-                completed_at=datetime.now(),
-                from_cache=False
-            )
+                "extracted_count": len(valid_contents),
+                "summary": summary,
+                "completed_at": datetime.now().isoformat(),
+                "from_cache": False
+            }
 
             # Cache the result
-            await self._cache_result(cache_key, result.dict())
+            await self._cache_result(query, cache_key, result)
 
             # Update job status
-            self.jobs[job_id]["status"] = "completed"
-            self.jobs[job_id]["progress"] = 100
-            self.jobs[job_id]["result"] = result
-
+            job["status"] = "completed"
+            job["progress"] = 100
+            job["result"] = result
+            await self._persist_job(job_id, job)
+
+        except* Exception as eg:
+            # except* unwraps TaskGroup failures so the job error reports
+            # the real cause(s), not "unhandled errors in a TaskGroup"
+            for exc in eg.exceptions:
+                logger.error(f"Research failed for job {job_id}: {exc}")
+            job["status"] = "failed"
+            job["error"] = "; ".join(str(exc) for exc in eg.exceptions)
+            await self._persist_job(job_id, job)
+
+        finally:
+            # Signal end-of-stream to any attached SSE client
+            stream = job.get("stream")
+            if stream:
+                await stream.put(None)
+
+    async def _warm_extractor(self):
+        """Warm the Playwright browser; extraction falls back if this fails"""
+        try:
+            await self.extractor.start_browser(settings.max_concurrent_extractions)
         except Exception as e:
-            logger.error(f"Research failed for job {job_id}: {e}")
-            self.jobs[job_id]["status"] = "failed"
-            self.jobs[job_id]["error"] = str(e)
+            logger.warning(f"Extractor warmup failed: {e}")
 
     async def get_result(self, job_id: str) -> Optional[Dict]:
         """Get research result for job"""
-        job = self.jobs.get(job_id)
+        job = await self._load_job(job_id)
         if not job or job.get("status") != "completed":
             return None
 
-        result = job.get("result")
-        if isinstance(result, ResearchResult):
-            return result.dict()
-
-        return result
+        # Results are stored as plain dicts; no re-serialization needed
+        return job.get("result")
 
-    def get_job_status(self, job_id: str) -> Dict:
+    async def get_job_status(self, job_id: str) -> Dict:
         """Get job status"""
-        job = self.jobs.get(job_id)
+        job = await self._load_job(job_id)
         if not job:
             return {
                 "status": "not_found",
@@ -218,33 +369,59 @@ class ResearchOrchestrator:
                            freshness: Optional[str], style: str) -> str:
         """Generate cache key for research query"""
         key_data = f"{query}|{max_results}|{freshness}|{style}"
-        return hashlib.md5(key_data.encode()).hexdigest()
+        # xxh3 beats MD5 by a wide margin on short keys; no need for a
+        # cryptographic hash here
+        return xxhash.xxh3_128_hexdigest(key_data)
+
+    async def _check_cache(self, query: str, cache_key: str) -> Optional[Dict]:
+        """Check for cached research result
 
-    async def _check_cache(self, cache_key: str) -> Optional[Dict]:
-        """Check for cached research result"""
-        # Check semantic cache first
-        semantic_result = await self.vector_cache.search_similar(cache_key)
+        The semantic cache sees the natural-language query so paraphrased
+        questions can match; the MD5 key is only for exact-match SQLite.
+        """
+        # Check the in-process LRU first: no async hop, no JSON parse
+        hot = self._hot.get(cache_key)
+        if hot and hot["expires_at"] > time.monotonic():
+            self._hot.move_to_end(cache_key)
+            return hot["result"]
+
+        # Check semantic cache
+        semantic_result = await self.vector_cache.search_similar(query)
         if semantic_result:
             return semantic_result
 
         # Check SQLite cache
         cached = await self.sqlite_cache.get(cache_key)
         if cached:
-            return json.loads(cached)
+            result = orjson.loads(cached)
+            self._hot_store(cache_key, result)
+            return result
 
         return None
 
-    async def _cache_result(self, cache_key: str, result: Dict):
+    def _hot_store(self, cache_key: str, result: Dict):
+        """Keep a parsed result in the bounded in-process LRU"""
+        self._hot[cache_key] = {
+            "result": result,
+            "expires_at": time.monotonic() + settings.cache_ttl
+        }
+        self._hot.move_to_end(cache_key)
+        while len(self._hot) > self._hot_cap:
+            self._hot.popitem(last=False)
+
+    async def _cache_result(self, query: str, cache_key: str, result: Dict):
         """Cache research result"""
-        # Cache in SQLite
+        # Cache in SQLite; orjson emits bytes and handles datetimes natively
         await self.sqlite_cache.set(
             key=cache_key,
-            value=json.dumps(result),
+            value=orjson.dumps(result),
             ttl=settings.cache_ttl
         )
 
-        # Cache semantically
-        await self.vector_cache.store(cache_key, result)
+        # Cache semantically under the raw query text
+        await self.vector_cache.store(query, result)
+
+        self._hot_store(cache_key, result)
 
     def _create_empty_summary(self) -> Dict:
         """Create empty summary when no content is available"""
@@ -254,7 +431,7 @@ class ResearchOrchestrator:
                 "Overview": "Unable to generate summary due to content extraction issues."
             },
             "sources": [],
-            "generated_at": datetime.now(),
+            "generated_at": datetime.now().isoformat(),
             "word_count": 0,
             "model_used": "none",
             "provider": "none",
@@ -1,4 +1,5 @@
 import asyncio
+import heapq
 import aiohttp
 from typing import List, Dict, Optional
 from datetime import datetime
@@ -11,10 +12,17 @@ logger = logging.getLogger(__name__)
 class MultiSearcher:
     """Multi-engine search with automatic fallback"""
 
-    def __init__(self, brave_api_key: Optional[str] = None):
+    def __init__(
+        self,
+        brave_api_key: Optional[str] = None,
+        max_concurrent_engine_calls: int = 4
+    ):
         self.brave_api_key = brave_api_key
         self.ddgs = AsyncDDGS()
         self.session = None
+        # Cap outbound engine calls across concurrent research jobs so
+        # bursts don't trip provider rate limits into retry storms
+        self._engine_sem = asyncio.Semaphore(max_concurrent_engine_calls)
 
     async def __aenter__(self):
         self.session = aiohttp.ClientSession()
@@ -44,36 +52,62 @@ class MultiSearcher:
             freshness: Time filter (pd, pw, pm, py)
             engines: List of search engines to use
         """
-        results = []
         tasks = []
 
-        # Create search tasks for each engine
+        # Create search tasks for each engine, gated by the shared semaphore
         if "duckduckgo" in engines:
-            tasks.append(self._search_duckduckgo(query, count, freshness))
+            tasks.append(self._with_engine_sem(
+                self._search_duckduckgo(query, count, freshness)
+            ))
 
         if "brave" in engines and self.brave_api_key:
-            tasks.append(self._search_brave(query, count, freshness))
+            tasks.append(self._with_engine_sem(
+                self._search_brave(query, count, freshness)
+            ))
 
-        # Execute searches in parallel
-        if tasks:
-            search_results = await asyncio.gather(*tasks, return_exceptions=True)
+        if not tasks:
+            return []
 
-            # Process results and handle errors
-            seen_urls = set()
-            for engine_results in search_results:
-                if isinstance(engine_results, Exception):
-                    logger.error(f"Search engine error: {engine_results}")
-                    continue
+        # Execute searches in parallel
+        search_results = await asyncio.gather(*tasks, return_exceptions=True)
+
+        # Each engine already returns its results ranked (DuckDuckGo scores
+        # descend by construction, Brave is API-ordered), so there is
+        # nothing to re-sort: a single list passes through as-is and
+        # multiple lists merge as sorted streams in O(N)
+        ranked_lists = []
+        for engine_results in search_results:
+            if isinstance(engine_results, Exception):
+                logger.error(f"Search engine error: {engine_results}")
+                continue
+            if engine_results:
+                ranked_lists.append(engine_results)
+
+        if not ranked_lists:
+            return []
 
-                for result in engine_results:
-                    if result['url'] not in seen_urls:
-                        results.append(result)
-                        seen_urls.add(result['url'])
+        if len(ranked_lists) == 1:
+            ranked = ranked_lists[0]
+        else:
+            ranked = heapq.merge(
+                *ranked_lists,
+                key=lambda x: -x.get('relevance_score', 0)
+            )
+
+        # Dedupe by URL in ranked order, stopping once we have enough
+        merged = {}
+        for result in ranked:
+            if result['url'] not in merged:
+                merged[result['url']] = result
+                if len(merged) >= count:
+                    break
 
-        # Sort by relevance score
-        results.sort(key=lambda x: x.get('relevance_score', 0), reverse=True)
+        return list(merged.values())
 
-        return results[:count]
+    async def _with_engine_sem(self, coro):
+        """Run an engine call under the outbound-concurrency semaphore"""
+        async with self._engine_sem:
+            return await coro
 
     async def _search_duckduckgo(
         self,
@@ -104,24 +138,30 @@ class MultiSearcher:
                 "safesearch": "moderate"
             }
 
-            # Perform search with enhanced parameters
+            # Perform search with enhanced parameters; the timestamp is per
+            # search, not per result, so compute it once outside the loop
+            now_iso = datetime.now().isoformat()
             results = []
             async for result in self.ddgs.text(**search_params):
-                # Enhanced result processing with better metadata
+                title = result.get("title") or ""
+                url = result.get("href") or ""
+                body = result.get("body") or ""
+                date = result.get("date")
+
                 result_dict = {
-                    "title": result.get("title", ""),
-                    "url": result.get("href", ""),
-                    "description": result.get("body", ""),
-                    "snippet": result.get("body", ""),  # Additional snippet field
+                    "title": title,
+                    "url": url,
+                    "description": body,
+                    "snippet": body,  # Additional snippet field
                     "source": "duckduckgo",
                     "relevance_score": 0.9 - (len(results) * 0.05),
-                    "timestamp": datetime.now().isoformat(),
+                    "timestamp": now_iso,
                     "engine": "duckduckgo"
                 }
 
                 # Add age information if available
-                if result.get("date"):
-                    result_dict["age"] = result.get("date")
+                if date:
+                    result_dict["age"] = date
 
                 results.append(result_dict)
 
@@ -227,25 +267,27 @@ class MultiSearcher:
                 "safesearch": "moderate"
             }
 
+            now_iso = datetime.now().isoformat()
             results = []
-            async for result in self.ddgs.text(**search_params):
-                result_dict = {
-                    "title": result.get("title", ""),
-                    "url": result.get("href", ""),
-                    "description": result.get("body", ""),
-                    "snippet": result.get("body", ""),
-                    "source": result.get("source", "duckduckgo-news"),
-                    "date": result.get("date"),
-                    "relevance_score": 0.9 - (len(results) * 0.05),
-                    "timestamp": datetime.now().isoformat(),
-                    "engine": "duckduckgo-news",
-                    "type": "news"
-                }
+            async with self._engine_sem:
+                async for result in self.ddgs.text(**search_params):
+                    body = result.get("body") or ""
 
-                results.append(result_dict)
+                    results.append({
+                        "title": result.get("title") or "",
+                        "url": result.get("href") or "",
+                        "description": body,
+                        "snippet": body,
+                        "source": result.get("source") or "duckduckgo-news",
+                        "date": result.get("date"),
+                        "relevance_score": 0.9 - (len(results) * 0.05),
+                        "timestamp": now_iso,
+                        "engine": "duckduckgo-news",
+                        "type": "news"
+                    })
 
-                if len(results) >= count:
-                    break
+                    if len(results) >= count:
+                        break
 
             logger.info(f"DuckDuckGo news search completed: {len(results)} results for '{query}'")
             return results
@@ -253,58 +295,3 @@ class MultiSearcher:
         except Exception as e:
             logger.error(f"DuckDuckGo news search error: {e}")
             return []
-
-    async def _search_brave(
-        self, 
-        query: str, 
-        count: int,
-        freshness: Optional[str]
-    ) -> List[Dict]:
-        """Search using Brave Search API"""
-        if not self.brave_api_key or not self.session:
-            return []
-        
-        headers = {
-            "Accept": "application/json",
-            "X-Subscription-Token": self.brave_api_key
-        }
-        
-        params = {
-            "q": query,
-            "count": count,
-            "text_decorations": False,
-            "search_lang": "en"
-        }
-        
-        if freshness:
-            params["freshness"] = freshness
-        
-        try:
-            async with self.session.get(
-                "https://api.search.brave.com/res/v1/web/search",
-                headers=headers,
-                params=params,
-                timeout=aiohttp.ClientTimeout(total=10)
-            ) as response:
-                if response.status != 200:
-                    logger.error(f"Brave API error: {response.status}")
-                    return []
-                
-                data = await response.json()
-                
-                results = []
-                for item in data.get("web", {}).get("results", []):
-                    results.append({
-                        "title": item.get("title", ""),
-                        "url": item.get("url", ""),
-                        "description": item.get("description", ""),
-                        "age": item.get("age"),
-                        "source": "brave",
-                        "relevance_score": item.get("relevance_score", 0.5)
-                    })
-                
-                return results
-                
-        except Exception as e:
-            logger.error(f"Brave search error: {e}")
-            return []
\ No newline at end of file
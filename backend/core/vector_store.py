@@ -1,10 +1,11 @@
 import asyncio
 import json
 import logging
+import math
 from typing import Dict, List, Optional, Any
 import chromadb
 from chromadb.config import Settings
-import hashlib
+import xxhash
 
 from ..core.config import settings
 
@@ -13,10 +14,30 @@ logger = logging.getLogger(__name__)
 class SemanticCache:
     """Vector-based semantic caching using ChromaDB"""
 
+    # Adaptive threshold: weight on the per-region spread and the minimum
+    # number of observations before trusting region statistics
+    THRESHOLD_ALPHA = 0.5
+    MIN_REGION_OBSERVATIONS = 5
+
+    # Coalescing windows: one batched embedding pass over N texts is far
+    # cheaper than N sequential passes. Writes can afford a longer window;
+    # lookups sit on the request path so their window stays short.
+    ADD_WINDOW_S = 0.05
+    QUERY_WINDOW_S = 0.01
+    MAX_ADD_BATCH = 32
+
     def __init__(self):
         self.client = None
         self.collection = None
         self.initialized = False
+        # Per-region EMA of observed query distances, keyed by the cached
+        # entry the query landed on; dense regions earn a tighter threshold
+        self._region_stats: Dict[str, Dict[str, float]] = {}
+        # Pending batched operations and their window-flush tasks
+        self._pending_adds: List[tuple] = []
+        self._add_flusher: Optional[asyncio.Task] = None
+        self._pending_queries: List[tuple] = []
+        self._query_flusher: Optional[asyncio.Task] = None
 
     async def initialize(self):
         """Initialize ChromaDB client and collection"""
@@ -26,21 +47,28 @@ class SemanticCache:
         try:
             # Initialize ChromaDB client
             self.client = chromadb.PersistentClient(
-                path=settings.chroma_db_path,
+                path=settings.chroma_persist_dir,
                 settings=Settings(
                     anonymized_telemetry=False,
                     allow_reset=True
                 )
             )
 
-            # Get or create collection
+            # Get or create collection. Cosine distance is cheaper and more
+            # stable than L2 on normalized sentence embeddings, and a modest
+            # hnsw:M keeps the index graph (and per-query distance work)
+            # small for a cache of this size.
             collection_name = "research_cache"
             try:
                 self.collection = self.client.get_collection(collection_name)
             except ValueError:
                 self.collection = self.client.create_collection(
                     name=collection_name,
-                    metadata={"description": "Semantic cache for research results"}
+                    metadata={
+                        "description": "Semantic cache for research results",
+                        "hnsw:space": "cosine",
+                        "hnsw:M": 16
+                    }
                 )
 
             self.initialized = True
@@ -52,44 +80,58 @@ class SemanticCache:
 
     async def store(self, query: str, result: Dict):
         """Store research result in semantic cache"""
-        if not self.initialized:
-            await self.initialize()
+        # Generate document ID from query
+        doc_id = xxhash.xxh3_128_hexdigest(query)
+
+        # Prepare document content for embedding; the full payload rides
+        # along in metadata so a hit returns the real result instead of a
+        # placeholder
+        content = self._prepare_content(query, result)
+        metadata = {
+            "query": query,
+            "timestamp": result.get("completed_at", ""),
+            "result_type": "research_result",
+            "result_json": json.dumps(result, default=str)
+        }
+
+        # Coalesce near-simultaneous writes into one collection.add so the
+        # embedding model runs a single batched forward pass
+        self._pending_adds.append((doc_id, content, metadata))
+        if len(self._pending_adds) >= self.MAX_ADD_BATCH:
+            await self._flush_adds()
+        elif self._add_flusher is None or self._add_flusher.done():
+            self._add_flusher = asyncio.create_task(self._flush_adds_after_window())
+
+    async def _flush_adds_after_window(self):
+        """Flush pending writes once the coalescing window closes"""
+        await asyncio.sleep(self.ADD_WINDOW_S)
+        await self._flush_adds()
+
+    async def _flush_adds(self):
+        """Write all pending entries in one batched collection.add"""
+        batch, self._pending_adds = self._pending_adds, []
+        if not batch:
+            return
 
         try:
-            # Generate document ID from query
-            doc_id = hashlib.md5(query.encode()).hexdigest()
-
-            # Prepare document content for embedding
-            content = self._prepare_content(query, result)
-
-            # Store in ChromaDB
-            self.collection.add(
-                documents=[content],
-                metadatas=[{
-                    "query": query,
-                    "timestamp": result.get("completed_at", ""),
-                    "result_type": "research_result"
-                }],
-                ids=[doc_id]
+            # The embedding pass is CPU-bound; run it off the event loop
+            await asyncio.to_thread(
+                self.collection.add,
+                documents=[content for _, content, _ in batch],
+                metadatas=[metadata for _, _, metadata in batch],
+                ids=[doc_id for doc_id, _, _ in batch]
             )
-
-            logger.debug(f"Stored result for query: {query[:50]}...")
+            logger.debug(f"Stored {len(batch)} result(s) in semantic cache")
 
         except Exception as e:
             logger.error(f"Failed to store in semantic cache: {e}")
 
     async def search_similar(self, query: str, n_results: int = 5) -> Optional[Dict]:
         """Search for similar cached results"""
-        if not self.initialized:
-            await self.initialize()
-
         try:
-            # Search for similar documents
-            results = self.collection.query(
-                query_texts=[query],
-                n_results=n_results,
-                include=["documents", "metadatas", "distances"]
-            )
+            # Search for similar documents; lookups landing in the same
+            # window share a single batched collection.query
+            results = await self._query_batched(query, n_results)
 
             if not results["documents"] or not results["documents"][0]:
                 return None
@@ -101,27 +143,75 @@ class SemanticCache:
 
             # Use distance threshold (lower is more similar)
             min_distance = min(distances) if distances else 1.0
-            if min_distance > settings.semantic_similarity_threshold:
-                return None
 
             # Get the best match
             best_idx = distances.index(min_distance)
             best_metadata = metadatas[best_idx]
+            region_id = results["ids"][0][best_idx]
+
+            threshold = self._region_threshold(region_id)
+            self._observe_distance(region_id, min_distance)
 
-            # Reconstruct result from metadata
-            # Note: In a real implementation, you'd store the full result
-            # For now, we'll return a placeholder
-            return self._create_cached_result(query, best_metadata)
+            if min_distance > threshold:
+                return None
+
+            # Return the stored payload verbatim; entries written before the
+            # payload was stored alongside the embedding can't be served
+            result_json = best_metadata.get("result_json")
+            if not result_json:
+                return None
+
+            result = json.loads(result_json)
+            result["from_cache"] = True
+            return result
 
         except Exception as e:
             logger.error(f"Failed to search semantic cache: {e}")
             return None
 
+    async def _query_batched(self, query: str, n_results: int) -> Dict:
+        """Queue a lookup and wait for the shared batched query to resolve"""
+        future = asyncio.get_running_loop().create_future()
+        self._pending_queries.append((query, n_results, future))
+
+        if self._query_flusher is None or self._query_flusher.done():
+            self._query_flusher = asyncio.create_task(self._flush_queries_after_window())
+
+        return await future
+
+    async def _flush_queries_after_window(self):
+        """Run one collection.query for every lookup gathered in the window"""
+        await asyncio.sleep(self.QUERY_WINDOW_S)
+        batch, self._pending_queries = self._pending_queries, []
+        if not batch:
+            return
+
+        try:
+            raw = await asyncio.to_thread(
+                self.collection.query,
+                query_texts=[q for q, _, _ in batch],
+                n_results=max(n for _, n, _ in batch),
+                include=["documents", "metadatas", "distances"]
+            )
+        except Exception as e:
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        # Re-slice the batched response into the single-query shape the
+        # caller's processing expects
+        for i, (_, _, future) in enumerate(batch):
+            if not future.done():
+                future.set_result({
+                    "ids": [raw["ids"][i]],
+                    "documents": [raw["documents"][i]],
+                    "metadatas": [raw["metadatas"][i]],
+                    "distances": [raw["distances"][i]]
+                })
+
     async def clear_cache(self):
         """Clear all cached results"""
-        if not self.initialized:
-            await self.initialize()
-
         try:
             # Reset the collection
             collection_name = "research_cache"
@@ -137,9 +227,6 @@ class SemanticCache:
 
     async def get_stats(self) -> Dict:
         """Get cache statistics"""
-        if not self.initialized:
-            await self.initialize()
-
         try:
             count = self.collection.count()
             return {
@@ -173,26 +260,30 @@ class SemanticCache:
 
         return " | ".join(content_parts)
 
-    def _create_cached_result(self, query: str, metadata: Dict) -> Dict:
-        """Create a cached result from metadata"""
-        # This is a simplified reconstruction
-        # In production, you'd store the full result in the vector DB
-        return {
-            "job_id": f"cached_{hashlib.md5(query.encode()).hexdigest()[:8]}",
-            "query": query,
-            "search_engines_used": ["cached"],
-            "search_results": [],
-            "extracted_count": 0,
-            "summary": {
-                "summary": "Cached result - full details not available",
-                "sections": {"Note": "This is a cached result"},
-                "sources": [],
-                "generated_at": metadata.get("timestamp", ""),
-                "word_count": 0,
-                "model_used": "cached",
-                "provider": "cache",
-                "cost": 0.0
-            },
-            "completed_at": metadata.get("timestamp", ""),
-            "from_cache": True
-        }
\ No newline at end of file
+    def _region_threshold(self, region_id: str) -> float:
+        """Similarity threshold for a region of query space
+
+        Starts from the global setting and tightens to mean - alpha * stddev
+        of the distances observed around a cached entry, so dense regions
+        reject borderline matches a single global threshold would accept.
+        """
+        base = settings.semantic_similarity_threshold
+        stats = self._region_stats.get(region_id)
+
+        if not stats or stats["count"] < self.MIN_REGION_OBSERVATIONS:
+            return base
+
+        adaptive = stats["mean"] - self.THRESHOLD_ALPHA * math.sqrt(stats["var"])
+
+        # Never loosen beyond the global setting or collapse to zero
+        return max(base * 0.5, min(base, adaptive))
+
+    def _observe_distance(self, region_id: str, distance: float, alpha: float = 0.2):
+        """Update the running distance statistics for a region (EMA)"""
+        stats = self._region_stats.setdefault(
+            region_id, {"mean": distance, "var": 0.0, "count": 0}
+        )
+        delta = distance - stats["mean"]
+        stats["mean"] += alpha * delta
+        stats["var"] = (1 - alpha) * (stats["var"] + alpha * delta * delta)
+        stats["count"] += 1
\ No newline at end of file
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 from enum import Enum
@@ -38,7 +38,12 @@ class JobStatus(BaseModel):
     started_at: datetime
     error: Optional[str] = None
 
+# Result-shaped models are built only from our own pipeline output, so
+# they are frozen: no mutation after construction, and trusted build sites
+# can use model_construct() to skip per-field validation entirely.
 class SearchResult(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     title: str
     url: str
     description: str
@@ -47,6 +52,8 @@ class SearchResult(BaseModel):
     age: Optional[str] = None
 
 class ExtractedContent(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     url: str
     title: str
     text: str
@@ -57,6 +64,8 @@ class ExtractedContent(BaseModel):
     source_engine: Optional[str] = None
 
 class Source(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     id: int
     title: str
     url: str
@@ -65,6 +74,8 @@ class Source(BaseModel):
     source_engine: str
 
 class ResearchSummary(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     summary: str
     sections: Dict[str, str]
     sources: List[Source]
@@ -75,6 +86,8 @@ class ResearchSummary(BaseModel):
     cost: float
 
 class ResearchResult(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     job_id: str
     query: str
     search_engines_used: List[str]
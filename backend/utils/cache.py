@@ -1,135 +1,399 @@
-import sqlite3
-import json
+import asyncio
 import hashlib
+import math
+import sqlite3
 import pickle
-import threading
-from datetime import datetime, timedelta
+import time
+import aiosqlite
+import orjson
+import zstandard
+from collections import Counter, OrderedDict
 from typing import Optional, Dict, Any
-from contextlib import contextmanager
+from contextlib import asynccontextmanager
+
+# One-byte magic prefixes so new rows decode without trying pickle first;
+# rows written before the switch carry neither and fall back to pickle.
+# Large payloads get a zstd layer whose body is itself prefix-tagged.
+_ORJSON_MAGIC = b'\x01'
+_RAW_MAGIC = b'\x02'
+_ZSTD_MAGIC = b'\x03'
+
+# Compress anything over a page-ish size: text/JSON shrinks 4-8x, so the
+# SQLite page cache holds proportionally more entries
+_COMPRESS_MIN_BYTES = 4096
+_ZSTD_C = zstandard.ZstdCompressor(level=3)
+_ZSTD_D = zstandard.ZstdDecompressor()
+
+# Hot statements as module constants: sqlite3's per-connection statement
+# cache keys on the SQL text, so identical strings mean each statement is
+# planned once per connection instead of re-parsed per call
+_SQL_GET = """
+    SELECT value, expires_at_ts, hit_count FROM cache 
+    WHERE key = ? AND expires_at_ts > ?
+"""
+# Overwrites go through ON CONFLICT DO UPDATE rather than INSERT OR
+# REPLACE: REPLACE deletes the old row without firing the delete trigger
+# (absent recursive_triggers), which let the cache_stats aggregates
+# drift upward on every overwrite. The UPDATE path fires the update
+# trigger, keeping the size and hit sums balanced; hit_count resets to
+# zero like the fresh row REPLACE used to insert.
+_SQL_SET = """
+    INSERT INTO cache
+    (key, key_text, value, created_at, expires_at_ts, size_bytes)
+    VALUES (?, ?, ?, datetime('now'), ?, ?)
+    ON CONFLICT(key) DO UPDATE SET
+        key_text = excluded.key_text,
+        value = excluded.value,
+        created_at = excluded.created_at,
+        expires_at_ts = excluded.expires_at_ts,
+        size_bytes = excluded.size_bytes,
+        hit_count = 0
+"""
+_SQL_HIT = "UPDATE cache SET hit_count = hit_count + ? WHERE key = ?"
+_SQL_DELETE = "DELETE FROM cache WHERE key = ?"
 
 class SQLiteCache:
-    """Thread-safe SQLite cache with optional in-memory layer"""
-    
-    def __init__(self, db_path: str = "data/research_cache.db", use_memory: bool = True):
+    """SQLite cache with optional in-memory layer and pooled connections"""
+
+    POOL_SIZE = 5
+
+    # Hit-count flushing: accumulate in memory and write in one batch so
+    # the read path never pays a write transaction
+    HIT_FLUSH_SIZE = 256
+    HIT_FLUSH_INTERVAL_S = 5.0
+
+    def __init__(
+        self,
+        db_path: str = "data/research_cache.db",
+        use_memory: bool = True,
+        memory_max: int = 10_000
+    ):
         self.db_path = db_path
         self.use_memory = use_memory
-        self.memory_cache = {} if use_memory else None
-        self.lock = threading.Lock()
+        # Bounded LRU: unbounded growth here was a slow memory leak on a
+        # long-running server
+        self.memory_cache = OrderedDict() if use_memory else None
+        self.memory_max = memory_max
+        # Long-lived aiosqlite connections; opening one per call pays the
+        # connect syscalls and a cold page cache on every lookup
+        self._pool = None
+        self._pool_lock = asyncio.Lock()
+        self._pending_hits = Counter()
+        self._last_hit_flush = time.monotonic()
         self._init_db()
         
     def _init_db(self):
-        """Initialize SQLite database with proper schema"""
-        with self._get_connection() as conn:
+        """Initialize SQLite database with proper schema (one-time, sync)"""
+        conn = sqlite3.connect(self.db_path, timeout=30.0)
+        try:
             cursor = conn.cursor()
             
-            # Create cache table
+            # Create cache table; expiry is an integer unix epoch so the
+            # comparison in get() is a numeric index seek, not a TEXT
+            # compare against a per-row datetime('now')
+            # Fixed 16-byte digests as the primary key keep the B-tree
+            # comparisons and index pages small however long the logical
+            # key is; the original text rides along for debugging
             cursor.execute("""
                 CREATE TABLE IF NOT EXISTS cache (
-                    key TEXT PRIMARY KEY,
+                    key BLOB PRIMARY KEY,
+                    key_text TEXT,
                     value BLOB,
                     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                     expires_at TIMESTAMP,
+                    expires_at_ts INTEGER,
                     hit_count INTEGER DEFAULT 0,
                     size_bytes INTEGER
                 )
             """)
-            
+
+            # Migrate databases created before the epoch column existed
+            cursor.execute("PRAGMA table_info(cache)")
+            columns = {row[1] for row in cursor.fetchall()}
+            if 'expires_at_ts' not in columns:
+                cursor.execute("ALTER TABLE cache ADD COLUMN expires_at_ts INTEGER")
+                cursor.execute("""
+                    UPDATE cache 
+                    SET expires_at_ts = CAST(strftime('%s', expires_at) AS INTEGER)
+                """)
+            if 'key_text' not in columns:
+                # Rows keyed by raw text predate digest keys; they simply
+                # miss on lookup and age out through the expiry sweep
+                cursor.execute("ALTER TABLE cache ADD COLUMN key_text TEXT")
+
             # Create indices for performance
+            cursor.execute("DROP INDEX IF EXISTS idx_expires_at")
             cursor.execute("""
-                CREATE INDEX IF NOT EXISTS idx_expires_at 
-                ON cache(expires_at)
+                CREATE INDEX IF NOT EXISTS idx_expires_at_ts 
+                ON cache(expires_at_ts) WHERE expires_at_ts > 0
             """)
             
             cursor.execute("""
                 CREATE INDEX IF NOT EXISTS idx_created_at 
                 ON cache(created_at)
             """)
-            
+
+            # Running aggregates in a singleton row kept current by
+            # triggers, so get_stats is an O(1) point read instead of a
+            # full-table scan. Seeded once from any pre-existing rows.
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS cache_stats (
+                    id INTEGER PRIMARY KEY CHECK(id = 1),
+                    total_entries INTEGER NOT NULL DEFAULT 0,
+                    total_size INTEGER NOT NULL DEFAULT 0,
+                    sum_hits INTEGER NOT NULL DEFAULT 0,
+                    max_hits INTEGER NOT NULL DEFAULT 0
+                )
+            """)
+            cursor.execute("""
+                INSERT OR IGNORE INTO cache_stats
+                (id, total_entries, total_size, sum_hits, max_hits)
+                SELECT 1, COUNT(*), COALESCE(SUM(size_bytes), 0),
+                       COALESCE(SUM(hit_count), 0), COALESCE(MAX(hit_count), 0)
+                FROM cache
+            """)
+            cursor.execute("""
+                CREATE TRIGGER IF NOT EXISTS cache_stats_ins
+                AFTER INSERT ON cache BEGIN
+                    UPDATE cache_stats SET
+                        total_entries = total_entries + 1,
+                        total_size = total_size + COALESCE(NEW.size_bytes, 0),
+                        sum_hits = sum_hits + COALESCE(NEW.hit_count, 0),
+                        max_hits = MAX(max_hits, COALESCE(NEW.hit_count, 0))
+                    WHERE id = 1;
+                END
+            """)
+            cursor.execute("""
+                CREATE TRIGGER IF NOT EXISTS cache_stats_del
+                AFTER DELETE ON cache BEGIN
+                    UPDATE cache_stats SET
+                        total_entries = total_entries - 1,
+                        total_size = total_size - COALESCE(OLD.size_bytes, 0),
+                        sum_hits = sum_hits - COALESCE(OLD.hit_count, 0)
+                    WHERE id = 1;
+                END
+            """)
+            cursor.execute("""
+                CREATE TRIGGER IF NOT EXISTS cache_stats_upd
+                AFTER UPDATE OF hit_count, size_bytes ON cache BEGIN
+                    UPDATE cache_stats SET
+                        total_size = total_size
+                            + COALESCE(NEW.size_bytes, 0)
+                            - COALESCE(OLD.size_bytes, 0),
+                        sum_hits = sum_hits
+                            + COALESCE(NEW.hit_count, 0)
+                            - COALESCE(OLD.hit_count, 0),
+                        max_hits = MAX(max_hits, COALESCE(NEW.hit_count, 0))
+                    WHERE id = 1;
+                END
+            """)
+
             conn.commit()
-    
-    @contextmanager
-    def _get_connection(self):
-        """Get a database connection with proper handling"""
-        conn = sqlite3.connect(
-            self.db_path,
-            timeout=30.0,
-            isolation_level='DEFERRED'
-        )
-        conn.row_factory = sqlite3.Row
+        finally:
+            conn.close()
+
+    @asynccontextmanager
+    async def _connection(self):
+        """Borrow a pooled connection, creating the pool on first use"""
+        if self._pool is None:
+            async with self._pool_lock:
+                if self._pool is None:
+                    pool = asyncio.Queue()
+                    for _ in range(self.POOL_SIZE):
+                        conn = await aiosqlite.connect(
+                            self.db_path,
+                            timeout=30.0,
+                            cached_statements=64
+                        )
+                        conn.row_factory = aiosqlite.Row
+                        # WAL lets pooled readers proceed while one writer
+                        # commits; the rest keep the working set in RAM
+                        # instead of round-tripping to disk
+                        await conn.execute("PRAGMA journal_mode=WAL")
+                        await conn.execute("PRAGMA synchronous=NORMAL")
+                        await conn.execute("PRAGMA temp_store=MEMORY")
+                        await conn.execute("PRAGMA mmap_size=268435456")
+                        await conn.execute("PRAGMA cache_size=-64000")
+                        # Dry-run the hot statements so their plans sit in
+                        # the statement cache before the first real call
+                        await conn.execute(_SQL_GET, (b"", 0))
+                        await pool.put(conn)
+                    self._pool = pool
+
+        conn = await self._pool.get()
         try:
             yield conn
         finally:
-            conn.close()
+            await self._pool.put(conn)
+
+    async def _flush_hits(self):
+        """Write the accumulated hit counts in one batched transaction"""
+        snapshot = self._pending_hits
+        self._pending_hits = Counter()
+        self._last_hit_flush = time.monotonic()
+
+        async with self._connection() as conn:
+            await conn.executemany(
+                _SQL_HIT,
+                [(count, self._k(key)) for key, count in snapshot.items()]
+            )
+            await conn.commit()
+
+    async def close(self):
+        """Close every pooled connection (app shutdown)"""
+        if self._pool is None:
+            return
+        if self._pending_hits:
+            await self._flush_hits()
+        while not self._pool.empty():
+            conn = self._pool.get_nowait()
+            await conn.close()
+        self._pool = None
     
+    def _memory_store(self, key: str, value, deadline: float,
+                      hits: int = 0, size: int = 0):
+        """Insert into the memory tier, evicting if over the cap
+
+        Deadlines are monotonic floats: a hit compares two floats instead
+        of constructing datetime objects.
+        """
+        self.memory_cache[key] = {
+            'value': value,
+            'deadline': deadline,
+            'hits': hits,
+            'size': size
+        }
+        self.memory_cache.move_to_end(key)
+        while len(self.memory_cache) > self.memory_max:
+            self._memory_evict()
+
+    def _memory_evict(self):
+        """Frequency-aware eviction (v-LRU)
+
+        Among the least-recently-used tenth of the cache, drop the entry
+        with the lowest worth -- log(size + hits) -- so a burst of one-shot
+        queries can't push out hot, expensive-to-rebuild results the way
+        pure LRU would.
+        """
+        window = max(1, len(self.memory_cache) // 10)
+        candidates = []
+        for key in self.memory_cache:
+            candidates.append(key)
+            if len(candidates) >= window:
+                break
+
+        victim = min(
+            candidates,
+            key=lambda k: math.log(
+                self.memory_cache[k]['size']
+                + self.memory_cache[k]['hits']
+                + 1e-6
+            )
+        )
+        del self.memory_cache[victim]
+
+    @staticmethod
+    def _k(key: str) -> bytes:
+        """Digest a logical key to the fixed-size primary-key form"""
+        return hashlib.blake2b(key.encode(), digest_size=16).digest()
+
+    @staticmethod
+    def _decode(blob: bytes):
+        """Decode a stored BLOB, honoring the magic prefix
+
+        The payload after the prefix is handed around as a memoryview:
+        both zstd and orjson read straight from the buffer, so no copy of
+        the (potentially large) body is made just to strip one byte.
+        """
+        prefix = blob[:1]
+        view = memoryview(blob)
+        if prefix == _ZSTD_MAGIC:
+            blob = _ZSTD_D.decompress(view[1:])
+            view = memoryview(blob)
+            prefix = blob[:1]
+        if prefix == _ORJSON_MAGIC:
+            return orjson.loads(view[1:])
+        if prefix == _RAW_MAGIC:
+            # Raw callers may hand this to stdlib json, which rejects
+            # memoryviews, so this path keeps the one copy
+            return bytes(view[1:])
+        # Legacy row from before the serialization switch
+        return pickle.loads(blob)
+
     async def get(self, key: str) -> Optional[str]:
         """Get value from cache"""
         # Check memory cache first
         if self.use_memory and key in self.memory_cache:
             entry = self.memory_cache[key]
-            if datetime.now() < entry['expires_at']:
+            if time.monotonic() < entry['deadline']:
+                entry['hits'] += 1
+                self.memory_cache.move_to_end(key)
                 return entry['value']
             else:
                 del self.memory_cache[key]
         
         # Check SQLite
-        with self.lock:
-            with self._get_connection() as conn:
-                cursor = conn.cursor()
-                
-                cursor.execute("""
-                    SELECT value, expires_at FROM cache 
-                    WHERE key = ? AND expires_at > datetime('now')
-                """, (key,))
-                
-                result = cursor.fetchone()
-                
-                if result:
-                    value = pickle.loads(result['value'])
-                    
-                    # Update hit count
-                    cursor.execute("""
-                        UPDATE cache SET hit_count = hit_count + 1 
-                        WHERE key = ?
-                    """, (key,))
-                    conn.commit()
-                    
-                    # Add to memory cache
-                    if self.use_memory:
-                        self.memory_cache[key] = {
-                            'value': value,
-                            'expires_at': datetime.fromisoformat(result['expires_at'])
-                        }
-                    
-                    return value
-        
+        async with self._connection() as conn:
+            cursor = await conn.execute(_SQL_GET, (self._k(key), int(time.time())))
+
+            result = await cursor.fetchone()
+
+            if result:
+                value = self._decode(result['value'])
+
+                # Count the hit in memory; the batched flush keeps write
+                # transactions (and their fsyncs) off the read path
+                self._pending_hits[key] += 1
+
+                # Add to memory cache, seeding popularity from the row so
+                # a known-hot key isn't treated as a newcomer
+                if self.use_memory:
+                    remaining = result['expires_at_ts'] - time.time()
+                    self._memory_store(
+                        key, value,
+                        time.monotonic() + max(0.0, remaining),
+                        hits=result['hit_count'],
+                        size=len(result['value'])
+                    )
+
+        if self._pending_hits and (
+            len(self._pending_hits) >= self.HIT_FLUSH_SIZE
+            or time.monotonic() - self._last_hit_flush > self.HIT_FLUSH_INTERVAL_S
+        ):
+            await self._flush_hits()
+
+        if result:
+            return value
         return None
     
     async def set(self, key: str, value: str, ttl: int = 3600) -> bool:
         """Set value in cache with TTL"""
-        expires_at = datetime.now() + timedelta(seconds=ttl)
-        value_bytes = pickle.dumps(value)
+        expires_ts = int(time.time()) + ttl
+        # Callers that already hold serialized bytes (orjson.dumps upstream)
+        # are stored as-is; everything else goes through orjson, which is
+        # several times faster than pickle and smaller on disk
+        if isinstance(value, (bytes, bytearray)):
+            value_bytes = _RAW_MAGIC + bytes(value)
+        else:
+            value_bytes = _ORJSON_MAGIC + orjson.dumps(value)
+        if len(value_bytes) > _COMPRESS_MIN_BYTES:
+            value_bytes = _ZSTD_MAGIC + _ZSTD_C.compress(value_bytes)
         size_bytes = len(value_bytes)
         
         # Add to memory cache
         if self.use_memory:
-            self.memory_cache[key] = {
-                'value': value,
-                'expires_at': expires_at
-            }
+            self._memory_store(
+                key, value, time.monotonic() + ttl, size=size_bytes
+            )
         
         # Add to SQLite
-        with self.lock:
-            with self._get_connection() as conn:
-                cursor = conn.cursor()
-                
-                cursor.execute("""
-                    INSERT OR REPLACE INTO cache 
-                    (key, value, created_at, expires_at, size_bytes)
-                    VALUES (?, ?, datetime('now'), ?, ?)
-                """, (key, value_bytes, expires_at.isoformat(), size_bytes))
-                
-                conn.commit()
-                return True
+        async with self._connection() as conn:
+            await conn.execute(
+                _SQL_SET, (self._k(key), key, value_bytes, expires_ts, size_bytes)
+            )
+
+            await conn.commit()
+            return True
     
     async def delete(self, key: str) -> bool:
         """Delete a cache entry"""
@@ -138,33 +402,40 @@ class SQLiteCache:
             del self.memory_cache[key]
         
         # Remove from SQLite
-        with self.lock:
-            with self._get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute("DELETE FROM cache WHERE key = ?", (key,))
-                conn.commit()
-                return cursor.rowcount > 0
+        async with self._connection() as conn:
+            cursor = await conn.execute(_SQL_DELETE, (self._k(key),))
+            await conn.commit()
+            return cursor.rowcount > 0
     
     async def clear_expired(self) -> int:
         """Clear expired entries and return count"""
-        with self.lock:
-            with self._get_connection() as conn:
-                cursor = conn.cursor()
-                
-                cursor.execute("""
-                    DELETE FROM cache 
-                    WHERE expires_at < datetime('now')
-                """)
-                
-                conn.commit()
-                deleted_count = cursor.rowcount
+        # Delete in bounded batches with a commit between each so the sweep
+        # never holds a long write transaction against concurrent reads
+        deleted_count = 0
+        now_ts = int(time.time())
+        async with self._connection() as conn:
+            while True:
+                cursor = await conn.execute("""
+                    DELETE FROM cache
+                    WHERE rowid IN (
+                        SELECT rowid FROM cache
+                        WHERE expires_at_ts < ? LIMIT 1000
+                    )
+                """, (now_ts,))
+
+                await conn.commit()
+                if cursor.rowcount <= 0:
+                    break
+                deleted_count += cursor.rowcount
+                # Let queued readers and writers interleave between batches
+                await asyncio.sleep(0)
         
         # Clear memory cache
         if self.use_memory:
-            now = datetime.now()
+            now = time.monotonic()
             expired_keys = [
                 k for k, v in self.memory_cache.items() 
-                if v['expires_at'] < now
+                if v['deadline'] < now
             ]
             for key in expired_keys:
                 del self.memory_cache[key]
@@ -172,25 +443,26 @@ class SQLiteCache:
         return deleted_count
     
     async def get_stats(self) -> Dict[str, Any]:
-        """Get cache statistics"""
-        with self._get_connection() as conn:
-            cursor = conn.cursor()
-            
-            # Get overall stats
-            cursor.execute("""
-                SELECT 
-                    COUNT(*) as total_entries,
-                    SUM(size_bytes) as total_size,
-                    AVG(hit_count) as avg_hits,
-                    MAX(hit_count) as max_hits
-                FROM cache
-                WHERE expires_at > datetime('now')
-            """)
-            
-            stats = dict(cursor.fetchone())
-            
-            # Get memory cache stats
-            if self.use_memory:
-                stats['memory_entries'] = len(self.memory_cache)
-            
-            return stats
\ No newline at end of file
+        """Get cache statistics (O(1) read of the trigger-maintained row)
+
+        Counts include expired rows that clear_expired hasn't swept yet.
+        """
+        async with self._connection() as conn:
+            cursor = await conn.execute(
+                "SELECT * FROM cache_stats WHERE id = 1"
+            )
+            row = await cursor.fetchone()
+
+        total_entries = row['total_entries'] if row else 0
+        stats = {
+            'total_entries': total_entries,
+            'total_size': row['total_size'] if row else 0,
+            'avg_hits': (row['sum_hits'] / total_entries) if total_entries else 0,
+            'max_hits': row['max_hits'] if row else 0
+        }
+
+        # Get memory cache stats
+        if self.use_memory:
+            stats['memory_entries'] = len(self.memory_cache)
+
+        return stats
\ No newline at end of file
@@ -2,6 +2,7 @@ import streamlit as st
 import asyncio
 import time
 import json
+import urllib.request
 from datetime import datetime
 from typing import Dict, Optional
 import aiohttp
@@ -60,6 +61,19 @@ st.markdown("""
 # API configuration
 API_BASE_URL = "http://localhost:8000"
 
+@st.cache_data(ttl=10, show_spinner=False)
+def check_api_health(api_url: str) -> bool:
+    """Probe the backend /health endpoint, cached across reruns
+
+    The sidebar renders on every rerun (every 2s while a job polls), so
+    without the cache each rerun paid a full health round trip.
+    """
+    try:
+        with urllib.request.urlopen(f"{api_url}/health", timeout=3) as response:
+            return response.status == 200
+    except Exception:
+        return False
+
 class ResearchApp:
     """Streamlit application for AI Research Agent"""
 
@@ -118,14 +132,9 @@ class ResearchApp:
 
     def _render_api_status(self):
         """Render API connection status"""
-        try:
-            # Simple health check
-            response = asyncio.run(self._check_api_health())
-            if response:
-                st.success("✅ API Connected")
-            else:
-                st.error("❌ API Not Available")
-        except:
+        if check_api_health(self.api_url):
+            st.success("✅ API Connected")
+        else:
             st.error("❌ API Not Available")
 
     def _render_main_content(self):
@@ -174,7 +183,7 @@ class ResearchApp:
                 "search_engines": st.session_state.get("search_engines", ["duckduckgo"])
             }
 
-            response = asyncio.run(self._call_api("POST", "/research", job_data))
+            response = self._run(self._call_api("POST", "/research", job_data))
 
             if response and "job_id" in response:
                 st.session_state.current_job = response["job_id"]
@@ -187,12 +196,18 @@ class ResearchApp:
         except Exception as e:
             st.error(f"Error starting research: {str(e)}")
 
+    @st.fragment(run_every=2)
     def _render_job_status(self):
-        """Render current job status"""
+        """Render current job status
+
+        Runs as a fragment so only this block re-executes every 2s while
+        a job is in flight; the rest of the page (and its widgets) stay
+        rendered instead of the whole script rerunning.
+        """
         job_id = st.session_state.current_job
 
         try:
-            status_data = asyncio.run(self._call_api("GET", f"/research/status/{job_id}"))
+            status_data = self._run(self._call_api("GET", f"/research/status/{job_id}"))
 
             if status_data:
                 status = status_data.get("status", "unknown")
@@ -211,13 +226,9 @@ class ResearchApp:
                 # Progress bar
                 st.progress(progress / 100)
 
-                # Auto-refresh for running jobs
-                if status in ["starting", "searching", "extracting", "summarizing"]:
-                    time.sleep(2)
-                    st.rerun()
-
-                # Get results when completed
-                elif status == "completed":
+                # Get results when completed; running jobs refresh via
+                # the fragment's run_every interval
+                if status == "completed":
                     self._fetch_results(job_id)
 
         except Exception as e:
@@ -226,13 +237,15 @@ class ResearchApp:
     def _fetch_results(self, job_id: str):
         """Fetch completed research results"""
         try:
-            results = asyncio.run(self._call_api("GET", f"/research/results/{job_id}"))
+            results = self._run(self._call_api("GET", f"/research/results/{job_id}"))
 
             if results:
                 st.session_state.results = results
                 st.session_state.current_job = None
                 st.success("Research completed!")
-                st.rerun()
+                # Full-app rerun: the results section lives outside this
+                # fragment
+                st.rerun(scope="app")
 
         except Exception as e:
             st.error(f"Error fetching results: {str(e)}")
@@ -310,7 +323,7 @@ class ResearchApp:
         """Export results as PDF"""
         try:
             export_data = {"format": "pdf", "data": results}
-            response = asyncio.run(self._call_api("POST", "/export", export_data))
+            response = self._run(self._call_api("POST", "/export", export_data))
 
             if response and "file_path" in response:
                 st.success(f"PDF exported: {response['file_path']}")
@@ -324,7 +337,7 @@ class ResearchApp:
         """Export results as Markdown"""
         try:
             export_data = {"format": "markdown", "data": results}
-            response = asyncio.run(self._call_api("POST", "/export", export_data))
+            response = self._run(self._call_api("POST", "/export", export_data))
 
             if response and "file_path" in response:
                 st.success(f"Markdown exported: {response['file_path']}")
@@ -338,7 +351,7 @@ class ResearchApp:
         """Export results as JSON"""
         try:
             export_data = {"format": "json", "data": results}
-            response = asyncio.run(self._call_api("POST", "/export", export_data))
+            response = self._run(self._call_api("POST", "/export", export_data))
 
             if response and "file_path" in response:
                 st.success(f"JSON exported: {response['file_path']}")
@@ -358,35 +371,48 @@ class ResearchApp:
         st.header("📤 Export Options")
         st.info("Use the export buttons in the results section")
 
+    def _run(self, coro):
+        """Run a coroutine on the session's persistent event loop
+
+        asyncio.run would build and tear down a loop (and force a fresh
+        connection) per call; one loop per browser session lets the shared
+        aiohttp session keep its connections alive between reruns.
+        """
+        if "api_loop" not in st.session_state:
+            st.session_state.api_loop = asyncio.new_event_loop()
+        return st.session_state.api_loop.run_until_complete(coro)
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Lazily create the shared keep-alive session for this browser session"""
+        session = st.session_state.get("api_session")
+        if session is None or session.closed:
+            session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=32, keepalive_timeout=60)
+            )
+            st.session_state.api_session = session
+        return session
+
     async def _call_api(self, method: str, endpoint: str, data: Optional[Dict] = None):
         """Make API call to backend"""
         url = f"{self.api_url}{endpoint}"
 
         try:
-            async with aiohttp.ClientSession() as session:
-                if method == "GET":
-                    async with session.get(url) as response:
-                        if response.status == 200:
-                            return await response.json()
-                        else:
-                            return None
-                elif method == "POST":
-                    async with session.post(url, json=data) as response:
-                        if response.status == 200:
-                            return await response.json()
-                        else:
-                            return None
+            session = await self._get_session()
+            if method == "GET":
+                async with session.get(url) as response:
+                    if response.status == 200:
+                        return await response.json()
+                    else:
+                        return None
+            elif method == "POST":
+                async with session.post(url, json=data) as response:
+                    if response.status == 200:
+                        return await response.json()
+                    else:
+                        return None
         except:
             return None
 
-    async def _check_api_health(self) -> bool:
-        """Check if API is healthy"""
-        try:
-            result = await self._call_api("GET", "/health")
-            return result is not None
-        except:
-            return False
-
 def main():
     """Main application entry point"""
     app = ResearchApp()